@@ -0,0 +1,78 @@
+'''
+Additive pattern database construction for the 8 puzzle.
+
+A pattern database records, for every possible placement of a subset of the
+tiles, the minimum number of moves of those tiles needed to bring them to
+their goal cells (moves of the remaining tiles and the hole are free). Two
+databases over disjoint tile subsets can be summed to give a heuristic that
+is still admissible but far stronger than Manhattan distance.
+'''
+from collections import deque
+
+from puzzle import MOVES, encode_state
+
+# Disjoint tile subsets covering tiles 1-8: a 5-tile and a 3-tile pattern
+PATTERN_A = (1, 2, 3, 4, 5)
+PATTERN_B = (6, 7, 8)
+
+# Built databases keyed by (encoded goal, pattern) so repeated Problems with
+# the same goal reuse them
+_db_cache = {}
+
+def pattern_index(positions):
+    '''
+    Map an ordered tuple of pattern-tile cell positions to its database
+    index, treating the positions as digits of a base-9 number
+
+    :param positions: cell index (0-8) of each pattern tile, in pattern order
+    '''
+    index = 0
+    for position in reversed(positions):
+        index = index * 9 + position
+    return index
+
+def build_pattern_db(goal_state, pattern):
+    '''
+    Build the pattern database for the given goal board and tile subset via
+    breadth-first search outward from the goal placement. Returns a bytes
+    table of size 9**len(pattern) indexed by pattern_index; unreachable
+    placements (two tiles on one cell) are left at 0xFF.
+
+    :param goal_state: 3x3 int array
+    :param pattern: tuple of tile values the database tracks
+    '''
+    cache_key = (encode_state(goal_state), pattern)
+    if cache_key in _db_cache:
+        return _db_cache[cache_key]
+
+    goal_cells = {}
+    for i in range(3):
+        for j in range(3):
+            goal_cells[goal_state[i][j]] = 3*i + j
+
+    distances = bytearray(b"\xff" * 9 ** len(pattern))
+
+    # BFS from the goal placement; each step slides one pattern tile to an
+    # adjacent cell not held by another pattern tile. Since moves are
+    # reversible, distance from the goal equals distance to the goal.
+    start = tuple(goal_cells[tile] for tile in pattern)
+    distances[pattern_index(start)] = 0
+    queue = deque([start])
+
+    while queue:
+        positions = queue.popleft()
+        next_distance = distances[pattern_index(positions)] + 1
+
+        for slot, cell in enumerate(positions):
+            for neighbor_cell in MOVES[cell]:
+                if neighbor_cell in positions:
+                    continue
+                moved = positions[:slot] + (neighbor_cell,) + positions[slot+1:]
+                moved_index = pattern_index(moved)
+                if distances[moved_index] == 0xFF:
+                    distances[moved_index] = next_distance
+                    queue.append(moved)
+
+    db = bytes(distances)
+    _db_cache[cache_key] = db
+    return db
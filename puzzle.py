@@ -1,4 +1,67 @@
-import heapq
+import sys
+
+# numpy is optional; it backs the vectorized batch heuristic and the
+# compiled fast path
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional compiled fast path for the A* inner loop. The search is pure
+# integer arithmetic on packed states, which Numba compiles well; when numba
+# is not installed the interpreted implementation below is used instead.
+try:
+    from numba import njit
+    from numba.core import types
+    from numba.typed import Dict
+    NUMBA_AVAILABLE = np is not None
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def encode_state(board):
+    '''
+    Pack a 3x3 board into a single int, using 4 bits per tile. The tile in
+    row i, column j sits at bits 4*(3*i + j), so the whole board fits in
+    36 bits and can be hashed/compared as one plain int.
+
+    :param board: 3x3 int array
+    '''
+    state = 0
+    for i in range(3):
+        for j in range(3):
+            state |= board[i][j] << (4 * (3*i + j))
+    return state
+
+def decode_state(state):
+    '''
+    Unpack an encoded state back into a 3x3 nested list (for display)
+
+    :param state: int-encoded board
+    '''
+    return [[(state >> (4 * (3*i + j))) & 0xF for j in range(3)] for i in range(3)]
+
+def is_solvable(state, goal_state):
+    '''
+    Check whether the goal can be reached from the given state. On a 3x3
+    board a state and goal are mutually reachable exactly when their tile
+    orderings (ignoring the hole) have the same inversion parity.
+
+    :param state: int-encoded board
+    :param goal_state: int-encoded board
+    '''
+    def inversion_parity(s):
+        tiles = [(s >> (4*k)) & 0xF for k in range(9)]
+        tiles = [tile for tile in tiles if tile != 0]
+        inversions = sum(1 for a in range(8) for b in range(a + 1, 8)
+                         if tiles[a] > tiles[b])
+        return inversions % 2
+
+    return inversion_parity(state) == inversion_parity(goal_state)
+
+# Adjacent cell indices for each hole position; the 3x3 board never changes,
+# so the legal moves from every cell can be listed once
+MOVES = ((1, 3), (0, 2, 4), (1, 5), (0, 4, 6), (1, 3, 5, 7), (2, 4, 8),
+         (3, 7), (4, 6, 8), (5, 7))
 
 class PuzzleNode:
     '''
@@ -6,65 +69,168 @@ class PuzzleNode:
 
     Attributes
     ---
-    node_state: 3x3 2d int array
-        Represents the location of the numbers in the puzzle
+    node_state: int
+        Board packed 4 bits per tile (see encode_state); cell k holds its
+        tile value at bits 4*k
 
     parent_node: PuzzleNode
         Node which spawned this one
-        
+
     g: int
         Path cost value
 
     h: int
         Heuristic value
 
-    hole_location: 2x1 int array
-        Location of the hole (the 0) on the board
-    
+    f: int
+        Total estimated cost g + h, computed once at construction
+
+    hole_idx: int
+        Cell index (0-8) of the hole (the 0) on the board
+
     '''
-    def __init__(self, node_state, parent_node=None, h=0):
+    # Searches keep hundreds of thousands of nodes alive; slots cut the
+    # per-node memory substantially and speed up attribute access
+    __slots__ = ('node_state', 'parent_node', 'g', 'h', 'f', 'hole_idx')
+
+    def __init__(self, node_state, parent_node=None, h=0, hole_idx=None):
         self.node_state = node_state
-        self.parent_node = parent_node        
+        self.parent_node = parent_node
         self.g = (parent_node.g + 1) if parent_node else 0
-        self.h = h        
+        self.h = h
+        self.f = self.g + self.h
 
-        self.hole_location = self.get_hole_location()
+        # The parent already knows where the hole ended up, so only root
+        # nodes ever scan the board for it
+        if hole_idx is None:
+            hole_idx = next(k for k in range(9)
+                            if (node_state >> (4*k)) & 0xF == 0)
+        self.hole_idx = hole_idx
 
-    def get_hole_location(self):
-        '''
-        Find the location of the hole (0) on the board
-        '''
-        for i in range(3):
-            for j in range(3):
-                if self.node_state[i][j] == 0:
-                    return i, j
-        raise ValueError("No blank tile found")
-    
     def puzzle_rows(self):
         '''
         Return the puzzle board as a list of row strings with the g, h, and f of the node
         '''
         rows = [
             f"{row[0]}  {row[1]}  {row[2]}"
-            for row in self.node_state
+            for row in decode_state(self.node_state)
         ]
 
-        measures = [f"g={self.g}", f"h={self.h}", f"f={self.g + self.h}"]
+        measures = [f"g={self.g}", f"h={self.h}", f"f={self.f}"]
 
         return rows + measures
 
     def __lt__(self, other):
-        return (self.g + self.h) < (other.g + other.h)
-    
+        return self.f < other.f
+
     def __str__(self):
         result = ""
-        for row in self.node_state:
+        for row in decode_state(self.node_state):
             result += (f"{row[0]}  {row[1]}  {row[2]}\n")
 
         result += (f"Path Cost: {self.g}\nHeuristic: {self.h}\n")
-        result += (f"f(n) = {self.g + self.h}\n")
+        result += (f"f(n) = {self.f}\n")
         return result
 
+class IndexedHeap:
+    '''
+    Binary min-heap of puzzle nodes ordered by f, with a hash index from
+    each queued state to its heap position. A state rediscovered via a
+    cheaper path is updated in place (decrease-key) instead of being
+    inserted a second time, so the frontier never holds stale duplicates.
+
+    Attributes
+    ---
+    heap: PuzzleNode list
+        the heap array
+
+    pos: dict
+        maps each queued node_state to its index in the heap array
+
+    '''
+    def __init__(self):
+        self.heap = []
+        self.pos = {}
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, node):
+        '''
+        Insert a node, or if its state is already queued, replace that entry
+        and restore heap order (the replacement always has a lower f)
+
+        :param node: PuzzleNode to queue
+        '''
+        index = self.pos.get(node.node_state)
+        if index is None:
+            index = len(self.heap)
+            self.heap.append(node)
+            self.pos[node.node_state] = index
+        else:
+            self.heap[index] = node
+        self._sift_up(index)
+
+    def pop(self):
+        '''
+        Remove and return the node with the lowest f
+        '''
+        root = self.heap[0]
+        del self.pos[root.node_state]
+
+        last = self.heap.pop()
+        if self.heap:
+            self.heap[0] = last
+            self.pos[last.node_state] = 0
+            self._sift_down(0)
+        return root
+
+    def _less(self, a, b):
+        '''
+        Queue ordering: lowest f first, ties broken towards the deeper node,
+        which tends to reach the goal with fewer expansions
+        '''
+        return a.f < b.f or (a.f == b.f and a.g > b.g)
+
+    def _sift_up(self, index):
+        '''
+        Move the node at index up until its parent is no greater
+        '''
+        node = self.heap[index]
+        while index > 0:
+            parent_index = (index - 1) // 2
+            parent = self.heap[parent_index]
+            if not self._less(node, parent):
+                break
+            self.heap[index] = parent
+            self.pos[parent.node_state] = index
+            index = parent_index
+        self.heap[index] = node
+        self.pos[node.node_state] = index
+
+    def _sift_down(self, index):
+        '''
+        Move the node at index down until no child is smaller
+        '''
+        node = self.heap[index]
+        size = len(self.heap)
+        while True:
+            child_index = 2*index + 1
+            if child_index >= size:
+                break
+            right_index = child_index + 1
+            if right_index < size and self._less(self.heap[right_index],
+                                                 self.heap[child_index]):
+                child_index = right_index
+            child = self.heap[child_index]
+            if not self._less(child, node):
+                break
+            self.heap[index] = child
+            self.pos[child.node_state] = index
+            index = child_index
+        self.heap[index] = node
+        self.pos[node.node_state] = index
+
 class Problem:
     '''Creates 8 Puzzle problem
     
@@ -74,24 +240,77 @@ class Problem:
 
     use_manhattan: bool
 
+    use_pdb: bool
+        use additive pattern databases as the heuristic; stronger than
+        Manhattan distance but built once per goal (see build_pdb)
+
+    goal_int: int
+        the goal board in packed form (see encode_state), so goal tests are
+        a single int comparison
+
     goal_positions: 9x2 int dict
         holds the positions of every tile in the goal configuration for heuristic
         calculations
-    
+
+    md: 9x9 int array
+        md[tile][cell] is the Manhattan distance of tile when it sits at cell,
+        so a move's effect on h can be computed without rescanning the board
+
     '''
-    def __init__(self, goal_state=None, use_manhattan=True):
+    def __init__(self, goal_state=None, use_manhattan=True, use_pdb=False):
         self.goal_state = goal_state if goal_state else [[1,2,3],[4,5,6],[7,8,0]]
-        self.use_manhattan = use_manhattan    
+        self.use_manhattan = use_manhattan
+        self.use_pdb = use_pdb
+        self.goal_int = encode_state(self.goal_state)
 
         # To find goal positions quickly for heuristic calculations
         self.goal_positions = {}
         for i in range(3):
             for j in range(3):
                 tile = self.goal_state[i][j]
-                self.goal_positions[tile] = (i,j)   
+                self.goal_positions[tile] = (i,j)
+
+        # Manhattan distance of each tile at each cell, so that moving one
+        # tile only costs a table lookup instead of a full board scan
+        self.md = [
+            [abs(k // 3 - self.goal_positions[tile][0])
+             + abs(k % 3 - self.goal_positions[tile][1]) for k in range(9)]
+            for tile in range(9)
+        ]
+
+        if np is not None:
+            # Per-tile goal coordinates for the vectorized batch heuristic
+            self.goal_row = np.array(
+                [self.goal_positions[tile][0] for tile in range(9)], dtype=np.int8)
+            self.goal_col = np.array(
+                [self.goal_positions[tile][1] for tile in range(9)], dtype=np.int8)
+
+        if use_pdb:
+            # Imported here since build_pdb imports the move table from
+            # this module
+            from build_pdb import build_pattern_db, PATTERN_A, PATTERN_B
+            self.pdb_a = build_pattern_db(self.goal_state, PATTERN_A)
+            self.pdb_b = build_pattern_db(self.goal_state, PATTERN_B)
+            # Base-9 digit weight of each pattern tile for indexing the
+            # databases with a single scan of the board
+            self.pdb_mult_a = {tile: 9**slot for slot, tile in enumerate(PATTERN_A)}
+            self.pdb_mult_b = {tile: 9**slot for slot, tile in enumerate(PATTERN_B)}
+
+        # The heuristic is fixed for the whole search, so bind the chosen
+        # routine once instead of re-branching on every call
+        if use_pdb:
+            self._heur = self.calculate_pattern_db
+        elif use_manhattan:
+            self._heur = self.calculate_manhattan_distance
+        else:
+            self._heur = self.calculate_misplaced_tiles
+
+        # Whether neighbor h values can be derived from the parent's via the
+        # Manhattan delta table
+        self.incremental_h = use_manhattan and not use_pdb
 
         self.nodes_expanded = 0
-        self.nodes_generated = 0      
+        self.nodes_generated = 0
 
     def calculate_manhattan_distance(self, state):
         '''
@@ -101,13 +320,12 @@ class Problem:
         :param state: The state the heuristic is being calculated for
         '''
         h = 0
-        for i in range(3):
-            for j in range(3):
-                tile = state[i][j]
-                if tile!= 0:            # Don't count the hole/0 towards calculation                    
-                    goal_i, goal_j = self.goal_positions[tile]
-                    h += abs(i - goal_i) + abs(j - goal_j)
-                    
+        for k in range(9):
+            tile = (state >> (4*k)) & 0xF
+            if tile != 0:               # Don't count the hole/0 towards calculation
+                goal_i, goal_j = self.goal_positions[tile]
+                h += abs(k // 3 - goal_i) + abs(k % 3 - goal_j)
+
         return h
 
     def calculate_misplaced_tiles(self, state):
@@ -117,62 +335,106 @@ class Problem:
         
         :param state: The state the heuristic is being calculated for
         '''
-        h = 0        
-        for tile in range(1,9):         # Don't count the hole/0 towards calculation
-            goal_i, goal_j = self.goal_positions[tile]
-            if tile != state[goal_i][goal_j]:
-                h +=1
-
-        return h    
+        # Fold each nibble of x down to its lowest bit, giving a 9-bit mask
+        # of the cells whose nibble is nonzero
+        def nonzero_cells(x):
+            return (x | (x >> 1) | (x >> 2) | (x >> 3)) & 0x111111111
+
+        # Cells differing from the goal, minus the hole cell (whose nibble
+        # in state is 0): one XOR, a couple of shifts, and a popcount
+        return (nonzero_cells(state ^ self.goal_int) & nonzero_cells(state)).bit_count()
     
+    def batch_manhattan(self, states):
+        '''
+        Vectorized Manhattan distance over a whole batch of states at once,
+        amortizing interpreter overhead when many states are evaluated
+        together (benchmarking, beam-style searches). Requires numpy.
+
+        :param states: (N, 9) integer array of boards, tile values in cell order
+        :returns: (N,) array of heuristic values
+        '''
+        if np is None:
+            raise RuntimeError("batch_manhattan requires numpy")
+
+        cells = np.arange(9)
+        # Where each tile sits vs. where its goal cell is, per board
+        row_diff = np.abs(cells // 3 - self.goal_row[states])
+        col_diff = np.abs(cells % 3 - self.goal_col[states])
+
+        # The hole doesn't count towards the heuristic
+        return np.where(states != 0, row_diff + col_diff, 0).sum(axis=1)
+
+    def calculate_pattern_db(self, state):
+        '''
+        Returns heuristic value; sums the two disjoint pattern database
+        entries for the state, located with one scan of the board
+
+        :param state: The state the heuristic is being calculated for
+        '''
+        index_a = 0
+        index_b = 0
+        for k in range(9):
+            tile = (state >> (4*k)) & 0xF
+            if tile in self.pdb_mult_a:
+                index_a += self.pdb_mult_a[tile] * k
+            elif tile in self.pdb_mult_b:
+                index_b += self.pdb_mult_b[tile] * k
+
+        return self.pdb_a[index_a] + self.pdb_b[index_b]
+
     def calculate_heuristic(self, state):
         '''
         Calculate heuristic depending on the desired measure for the problem. Either
-        Manhattan Distance or Misplaced Tiles.
-        
+        the pattern databases, Manhattan Distance, or Misplaced Tiles.
+
         :param state: The state the heuristic is being calculated for
         '''
-        if self.use_manhattan:
-            h = self.calculate_manhattan_distance(state)
-        else:
-            h = self.calculate_misplaced_tiles(state)
-
-        return h
+        return self._heur(state)
                 
-    def is_valid_move(self, i, j):
+    def get_neighbors(self, current_node, best_g):
         '''
-        Checks if a potential move is valid. Returns true if the coordinates are within
-        the board space (between 0 and 3)
+        Expand a node, returning the neighbors which improve on the best
+        known path cost to their state (and recording those costs). Pruned
+        neighbors are rejected before a node object is ever built for them.
 
-        :param i: Row coordinate
-        :param j: Column coordinate
+        :param current_node: PuzzleNode being expanded
+        :param best_g: dict mapping reached states to their best path cost
         '''
-        return 0 <= i < 3 and 0 <= j < 3
-
-    def get_neighbors(self, current_node):
         self.nodes_expanded += 1
         neighbors = []
-        
-        hole_i, hole_j = current_node.hole_location
 
-        # For each possible move, confirm it is valid and then add it to the queue
-        for delta_i, delta_j in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            new_i, new_j = hole_i+delta_i, hole_j+delta_j
-            if self.is_valid_move(new_i, new_j):
-                new_state = [row[:] for row in current_node.node_state]
+        hole = current_node.hole_idx
+        new_g = current_node.g + 1
 
-                # Moving a tile into the hole to create the new state
-                new_state[hole_i][hole_j], new_state[new_i][new_j] = \
-                    new_state[new_i][new_j], new_state[hole_i][hole_j]
+        # Every legal move slides the tile from an adjacent cell into the hole
+        for src in MOVES[hole]:
+            tile = (current_node.node_state >> (4*src)) & 0xF
 
-                new_h = self.calculate_heuristic(new_state)
-                
-                # Setting current node as the parent to maintain branch structure
-                new_node = PuzzleNode(new_state, current_node, h=new_h)
+            # Moving a tile into the hole to create the new state: clear
+            # its old nibble and write it into the hole's nibble
+            new_state = (current_node.node_state ^ (tile << (4*src))) \
+                | (tile << (4*hole))
+            self.nodes_generated += 1
 
-                neighbors.append(new_node)
-                self.nodes_generated += 1
-        return neighbors        
+            # Drop states already reached at least as cheaply before paying
+            # for a heuristic or a node object
+            if new_g >= best_g.get(new_state, 1 << 30):
+                continue
+            best_g[new_state] = new_g
+
+            if self.incremental_h:
+                # Only one tile moved (src -> hole), so adjust the
+                # parent's h by that tile's change in Manhattan distance
+                new_h = current_node.h - self.md[tile][src] + self.md[tile][hole]
+            else:
+                new_h = self._heur(new_state)
+
+            # Setting current node as the parent to maintain branch structure;
+            # the hole is now where the moved tile came from
+            new_node = PuzzleNode(new_state, current_node, h=new_h, hole_idx=src)
+
+            neighbors.append(new_node)
+        return neighbors
 
 def construct_path(goal_state):
     '''
@@ -190,6 +452,158 @@ def construct_path(goal_state):
     path.reverse()
     return path
 
+if NUMBA_AVAILABLE:
+    # MOVES padded with -1 to a rectangular array the kernel can index
+    NB_MOVES = np.array([list(m) + [-1] * (4 - len(m)) for m in MOVES],
+                        dtype=np.int64)
+
+    @njit(cache=True)
+    def _astar_nb(start, goal, md, moves):
+        '''
+        Compiled A* inner loop over int-encoded states. Mirrors the
+        interpreted search: bucket queue keyed on f, best path cost per
+        state, incremental Manhattan updates. Returns a parent map from each
+        reached state to its predecessor plus search statistics.
+
+        :param start: int-encoded initial state
+        :param goal: int-encoded goal state
+        :param md: 9x9 int64 array of per-tile Manhattan distances
+        :param moves: 9x4 int64 array of adjacent cells per hole position
+        '''
+        best_g = Dict.empty(key_type=types.int64, value_type=types.int64)
+        parent = Dict.empty(key_type=types.int64, value_type=types.int64)
+
+        # Heuristic and hole position of the initial state
+        h0 = 0
+        hole0 = 0
+        for k in range(9):
+            tile = (start >> (4*k)) & 0xF
+            if tile == 0:
+                hole0 = k
+            else:
+                h0 += md[tile, k]
+
+        # Generated nodes live in flat parallel arrays; the frontier is a
+        # bucket queue of per-f linked lists threaded through nxt
+        cap = 1 << 16
+        states = np.empty(cap, dtype=np.int64)
+        gs = np.empty(cap, dtype=np.int64)
+        hs = np.empty(cap, dtype=np.int64)
+        holes = np.empty(cap, dtype=np.int64)
+        nxt = np.empty(cap, dtype=np.int64)
+
+        max_f = 64                  # f never exceeds 55 on the 8-puzzle
+        head = np.full(max_f, -1, dtype=np.int64)
+
+        states[0] = start
+        gs[0] = 0
+        hs[0] = h0
+        holes[0] = hole0
+        nxt[0] = -1
+        head[h0] = 0
+        n_nodes = 1
+
+        f_min = h0
+        best_g[start] = 0
+        expanded = 0
+        generated = 0
+
+        while True:
+            # Advance the cursor to the lowest non-empty bucket
+            while f_min < max_f and head[f_min] == -1:
+                f_min += 1
+            if f_min == max_f:
+                # Frontier exhausted without reaching the goal
+                return parent, expanded, generated, False
+
+            idx = head[f_min]
+            head[f_min] = nxt[idx]
+            state = states[idx]
+            g = gs[idx]
+
+            # Skip stale entries superseded by a cheaper path
+            if g > best_g[state]:
+                continue
+            if state == goal:
+                return parent, expanded, generated, True
+
+            h = hs[idx]
+            hole = holes[idx]
+            expanded += 1
+
+            for m in range(4):
+                src = moves[hole, m]
+                if src < 0:
+                    continue
+                tile = (state >> (4*src)) & 0xF
+                new_state = (state ^ (tile << (4*src))) | (tile << (4*hole))
+                generated += 1
+
+                new_g = g + 1
+                if new_state in best_g and best_g[new_state] <= new_g:
+                    continue
+                best_g[new_state] = new_g
+                parent[new_state] = state
+
+                if n_nodes == cap:
+                    # Double the node arrays
+                    cap *= 2
+                    grown_states = np.empty(cap, dtype=np.int64)
+                    grown_states[:n_nodes] = states
+                    states = grown_states
+                    grown_gs = np.empty(cap, dtype=np.int64)
+                    grown_gs[:n_nodes] = gs
+                    gs = grown_gs
+                    grown_hs = np.empty(cap, dtype=np.int64)
+                    grown_hs[:n_nodes] = hs
+                    hs = grown_hs
+                    grown_holes = np.empty(cap, dtype=np.int64)
+                    grown_holes[:n_nodes] = holes
+                    holes = grown_holes
+                    grown_nxt = np.empty(cap, dtype=np.int64)
+                    grown_nxt[:n_nodes] = nxt
+                    nxt = grown_nxt
+
+                new_h = h - md[tile, src] + md[tile, hole]
+                f = new_g + new_h
+                states[n_nodes] = new_state
+                gs[n_nodes] = new_g
+                hs[n_nodes] = new_h
+                holes[n_nodes] = src
+                nxt[n_nodes] = head[f]
+                head[f] = n_nodes
+                n_nodes += 1
+                if f < f_min:
+                    f_min = f
+
+def _a_star_solve_numba(problem, start_state, goal_state):
+    '''
+    Marshal a search into the compiled kernel and rebuild the solution path
+    as a PuzzleNode chain from the returned parent map.
+
+    :param problem: Problem object
+    :param start_state: int-encoded initial state
+    :param goal_state: int-encoded goal state
+    '''
+    md = np.array(problem.md, dtype=np.int64)
+    parent, expanded, generated, found = _astar_nb(start_state, goal_state, md, NB_MOVES)
+    problem.nodes_expanded += expanded
+    problem.nodes_generated += generated
+
+    if not found:
+        return None
+
+    # Walk the parent map back from the goal to recover the state sequence
+    path_states = [goal_state]
+    while path_states[-1] != start_state:
+        path_states.append(parent[path_states[-1]])
+    path_states.reverse()
+
+    node = None
+    for state in path_states:
+        node = PuzzleNode(state, node, h=problem.calculate_heuristic(state))
+    return construct_path(node)
+
 def a_star_solve(problem, initial_state):
     '''
     Given a problem and an initial state, will solve the problem and return the solution
@@ -197,73 +611,184 @@ def a_star_solve(problem, initial_state):
     :param problem: Problem object
     :param initial_state: 3x3 int array
     '''
-    initial_node = PuzzleNode(initial_state)
-    initial_node.h = problem.calculate_heuristic(initial_state)
+    initial_state_int = encode_state(initial_state)
+    initial_node = PuzzleNode(initial_state_int,
+                              h=problem.calculate_heuristic(initial_state_int))
 
-    frontier = [initial_node]
+    goal_state = problem.goal_int
 
-    # Putting frontier nodes in a heap, with the most promising nodes (lowest f) at the top
-    heapq.heapify(frontier)   
+    # Hand the search to the compiled kernel when available; it only knows
+    # the Manhattan heuristic, so other heuristics stay interpreted
+    if NUMBA_AVAILABLE and problem.incremental_h:
+        return _a_star_solve_numba(problem, initial_node.node_state, goal_state)
 
-    explored = set()
+    # Indexed heap frontier: a state rediscovered via a cheaper path has its
+    # queued entry decreased in place, so no stale duplicates accumulate
+    frontier = IndexedHeap()
+    frontier.push(initial_node)
+
+    # Best path cost found so far for each reached state
+    best_g = {initial_node.node_state: 0}
     max_frontier_size = 1
-    
+
     while frontier:
         max_frontier_size = max(max_frontier_size, len(frontier))
 
         # Pop off the puzzle node with the lowest f value
-        current_node = heapq.heappop(frontier)
-        current_state_tuple = tuple(tuple(row) for row in current_node.node_state)
-        
+        current_node = frontier.pop()
+
         # Check for goal state
-        if current_node.node_state == problem.goal_state:         
+        if current_node.node_state == goal_state:
             # If the goal has been found, compile the whole path and return
             return construct_path(current_node)
-        
-        # Find next possible moves and add current node to explored set 
-        neighbors = problem.get_neighbors(current_node) 
-        explored.add(current_state_tuple)
 
-        # Confirm neighbors haven't already been explored and add to frontier heap
-        for neighbor in neighbors:
-            neighbor_state_tuple = tuple(tuple(row) for row in neighbor.node_state)
-            if neighbor_state_tuple not in explored:
-                heapq.heappush(frontier, neighbor)
+        # A corner hole with the parent on one side leaves a single forced
+        # move. When that move keeps f unchanged its child would be popped
+        # next anyway (ties break towards deeper nodes), so follow the chain
+        # in place and skip the frontier operations for it entirely.
+        chain = 0
+        while (chain < 8 and current_node.parent_node is not None
+               and len(MOVES[current_node.hole_idx]) == 2
+               and current_node.parent_node.hole_idx in MOVES[current_node.hole_idx]):
+            # The move back to the parent always prunes, so at most the
+            # forced neighbor comes back
+            forced = problem.get_neighbors(current_node, best_g)
+            if not forced or forced[0].f != current_node.f:
+                for neighbor in forced:
+                    frontier.push(neighbor)
+                current_node = None
+                break
+
+            current_node = forced[0]
+            if current_node.node_state == goal_state:
+                return construct_path(current_node)
+            chain += 1
+
+        if current_node is None:
+            continue
+
+        # Find next possible moves; get_neighbors only returns (and records in
+        # best_g) neighbors improving on the best known path to their state
+        for neighbor in problem.get_neighbors(current_node, best_g):
+            frontier.push(neighbor)
 
-    # If the frontier has been completely searched without finding the goal, no solution exists   
+    # If the frontier has been completely searched without finding the goal, no solution exists
     return None
 
+def ida_star_solve(problem, initial_state):
+    '''
+    Given a problem and an initial state, solves it with iterative deepening
+    A*: repeated depth-first searches bounded by an f threshold that rises to
+    the smallest f pruned in the previous round. Uses O(solution depth)
+    memory and no frontier or reached-state bookkeeping at all.
+
+    :param problem: Problem object
+    :param initial_state: 3x3 int array
+    '''
+    state = encode_state(initial_state)
+    goal_state = problem.goal_int
+
+    # IDA* has no reached-state set to exhaust, so unsolvable boards must be
+    # rejected up front or the thresholds would rise forever
+    if not is_solvable(state, goal_state):
+        return None
+
+    hole = next(k for k in range(9) if (state >> (4*k)) & 0xF == 0)
+    h = problem.calculate_heuristic(state)
+    incremental = problem.incremental_h
+    md = problem.md
+
+    # The recursion stack doubles as the solution path
+    path_states = [state]
+    found = -1
+
+    def _dfs(state, hole, g, h, threshold, last_hole):
+        '''
+        Bounded DFS; returns the found sentinel on success, otherwise the
+        smallest f value that exceeded the threshold (the next threshold)
+        '''
+        f = g + h
+        if f > threshold:
+            return f
+        if state == goal_state:
+            return found
+
+        problem.nodes_expanded += 1
+        next_threshold = 1 << 30
+
+        for src in MOVES[hole]:
+            # Sliding the tile back where it just came from only undoes the
+            # previous move, so that branch can never be on an optimal path
+            if src == last_hole:
+                continue
+
+            tile = (state >> (4*src)) & 0xF
+            new_state = (state ^ (tile << (4*src))) | (tile << (4*hole))
+            problem.nodes_generated += 1
+
+            if incremental:
+                new_h = h - md[tile][src] + md[tile][hole]
+            else:
+                new_h = problem._heur(new_state)
+
+            path_states.append(new_state)
+            result = _dfs(new_state, src, g + 1, new_h, threshold, hole)
+            if result == found:
+                return found
+            path_states.pop()
+
+            if result < next_threshold:
+                next_threshold = result
+
+        return next_threshold
+
+    # Deepen the f threshold until a search round reaches the goal
+    threshold = h
+    while True:
+        result = _dfs(state, hole, 0, h, threshold, -1)
+        if result == found:
+            break
+        threshold = result
+
+    # Rebuild the path as a PuzzleNode chain for print_solution
+    node = None
+    for path_state in path_states:
+        node = PuzzleNode(node_state=path_state, parent_node=node,
+                          h=problem.calculate_heuristic(path_state))
+    return construct_path(node)
+
 def print_solution(path, problem):
     grids_per_row = 5
-        
-    # Printing each move in the path horizontally, in columns of 5
+
+    # Build every line up front and hand stdout one string at the end, so a
+    # long solution costs one flush instead of one per print call
+    out = []
+
+    # Formatting each move in the path horizontally, in columns of 5
     for start_idx in range(0, len(path), grids_per_row):
         end_idx = min(start_idx + grids_per_row, len(path))
-        chunk = path[start_idx:end_idx]      
-        
-        move_labels = " ".join([f"Move {i}:    " for i in range(start_idx, end_idx)])
-        print(f"\n{move_labels}")
+        chunk = path[start_idx:end_idx]
+        boards = [decode_state(node.node_state) for node in chunk]
+
+        out.append("")
+        out.append(" ".join(f"Move {i}:    " for i in range(start_idx, end_idx)))
 
         for row_idx in range(3):
-            row_str = "    ".join([
-                f"{node.node_state[row_idx][0]}  {node.node_state[row_idx][1]}  {node.node_state[row_idx][2]} "
-                for node in chunk
-            ])
-            print(f"{row_str}")
-                        
-        g_scores = " ".join([f" g ={node.g:2d}     " for node in chunk])
-        print(f"{g_scores}")
-        
-        h_scores = " ".join([f" h ={node.h:2d}     " for node in chunk])
-        print(f"{h_scores}")
+            out.append("    ".join(
+                f"{board[row_idx][0]}  {board[row_idx][1]}  {board[row_idx][2]} "
+                for board in boards
+            ))
 
-        f_scores = " ".join([f" f ={node.g + node.h:2d}     " for node in chunk])
-        print(f"{f_scores}")
-        
-    print("\nStatistics:")
-    print(f"Solution depth: {len(path) - 1}")
-    print(f"Nodes expanded: {problem.nodes_expanded}")
-    print(f"Nodes generated: {problem.nodes_generated}")
+        out.append(" ".join(f" g ={node.g:2d}     " for node in chunk))
+        out.append(" ".join(f" h ={node.h:2d}     " for node in chunk))
+        out.append(" ".join(f" f ={node.f:2d}     " for node in chunk))
+
+    out.append("\nStatistics:")
+    out.append(f"Solution depth: {len(path) - 1}")
+    out.append(f"Nodes expanded: {problem.nodes_expanded}")
+    out.append(f"Nodes generated: {problem.nodes_generated}")
+
+    sys.stdout.write("\n".join(out) + "\n")
         
 def get_puzzle_board_from_user(prompt="Enter puzzle board"):
     '''